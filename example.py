@@ -4,7 +4,13 @@ Run with: uvicorn example:app --reload
 
 This example demonstrates how to use FastAuth's authentication and role-based authorization features.
 """
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import sessionmaker
 from sqlmodel import create_engine, SQLModel, Session
 
 # Import directly from fastauth package
@@ -14,16 +20,28 @@ from fastauth import (
     CredentialsException, TokenException, UserNotFoundException, PermissionDeniedException
 )
 
+logging.basicConfig(level=logging.INFO)
+log = logging.getLogger("fastauth.example")
+
 # The old direct import from fastauth.py still works but will issue a deprecation warning
 # from fastauth import FastAuth  # from fastauth.py
 # from User import User
 
-# Create FastAPI app
-app = FastAPI(title="FastAuth Example App")
-
 # Database setup - using in-memory SQLite for demo
+# pool_size/max_overflow bound how many connections concurrent requests can
+# hold; pool_pre_ping drops stale connections before they are handed out.
+# Size these for your deployment - larger pools use more DB resources.
 DATABASE_URL = "sqlite:///./example.db"
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+# query_cache_size raises SQLAlchemy's compiled-statement cache above the
+# 500-entry default so hot statements stay compiled under varied workloads.
+engine = create_engine(
+    DATABASE_URL,
+    pool_size=20,
+    max_overflow=40,
+    pool_pre_ping=True,
+    query_cache_size=1200,
+    connect_args={"check_same_thread": False},
+)
 
 # There are two ways to initialize the database in FastAuth:
 # 1. Using the CLI tool before starting the application:
@@ -37,35 +55,57 @@ engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
 # In production, you might want to use the CLI tool instead
 INIT_DB_ON_STARTUP = True
 
-@app.on_event("startup")
-def on_startup():
+# Lifespan replaces the deprecated @app.on_event("startup") hook. The DDL
+# work runs in a threadpool so it doesn't block the event loop, and only
+# when INIT_DB_ON_STARTUP is set - under autoscaling, prefer running the CLI
+# once instead of having every worker re-check the schema catalog.
+@asynccontextmanager
+async def lifespan(app: FastAPI):
     if INIT_DB_ON_STARTUP:
         # Initialize database with tables, roles, and superadmin
-        print("Initializing database during startup...")
-        result = auth.initialize_db(
-            create_tables=True,         # Create database tables
-            init_roles=True,            # Initialize standard roles
-            create_admin=True,          # Create superadmin if doesn't exist
+        log.info("Initializing database during startup...")
+        result = await run_in_threadpool(
+            auth.initialize_db,
+            create_tables=True,          # Create database tables
+            init_roles=True,             # Initialize standard roles
+            create_admin=True,           # Create superadmin if doesn't exist
             admin_username="superadmin", # Default username
             admin_password="admin123"    # Default password
         )
-        
-        print("Database initialization results:")
-        for key, value in result.items():
-            print(f"  {key}: {value}")
+
+        # One lazy-formatted record instead of a print per key; print holds
+        # the stdout lock and flushes, which serializes multi-worker boots
+        log.info("Database initialization results: %s", result)
     else:
-        # Just make sure tables exist
-        SQLModel.metadata.create_all(engine)
-        print("Application started. Database checked.")
-        print("Note: Use the CLI tool to initialize roles and superadmin:")
-        print("python fastauth_init.py --db-url=\"sqlite:///./example.db\" --secret-key=\"your-secret-key\"")
+        log.info("Application started. Skipping database initialization.")
+        log.info(
+            "Use the CLI tool to initialize tables, roles, and superadmin: "
+            "python fastauth_init.py --db-url=\"sqlite:///./example.db\" --secret-key=\"your-secret-key\""
+        )
+    yield
 
+# Create FastAPI app
+# orjson serializes responses to bytes directly, noticeably faster than the
+# stdlib json encoder used by the default JSONResponse
+app = FastAPI(
+    title="FastAuth Example App",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
+# Session dependency - every request gets its own session from the pooled
+# engine and closes it when the request ends, returning the connection to
+# the pool. Don't use a scoped_session here: FastAPI runs sync dependencies
+# on arbitrary worker threads, so thread-local registries hand concurrent
+# requests the same session and tear down the wrong one.
+SessionLocal = sessionmaker(bind=engine, class_=Session)
 
-# Session dependency
 def get_session():
-    with Session(engine) as session:
+    session = SessionLocal()
+    try:
         yield session
+    finally:
+        session.close()
 
 # Initialize FastAuth with your configuration
 auth = FastAuth(
@@ -79,6 +119,13 @@ auth = FastAuth(
     refresh_token_expires_in=7   # 7 days
 )
 
+# Bind the guard dependencies once at import time so every route reuses the
+# same callable object and FastAPI can cache its signature inspection
+active_user_dep = auth.get_current_active_user_dependency()
+admin_dep = auth.is_admin()
+premium_dep = auth.require_roles(["premium", "admin"])
+premium_verified_dep = auth.require_all_roles(["premium", "verified"])
+
 # Get pre-configured auth router (includes login, refresh, register, and user info endpoints)
 auth_router = auth.get_auth_router(get_session)
 
@@ -94,7 +141,7 @@ auth.setup_exception_handlers(app)
 
 # Protected route example - requires authentication only
 @app.get("/protected", tags=["protected"])
-async def protected_route(current_user = Depends(auth.get_current_active_user_dependency())):
+async def protected_route(current_user = Depends(active_user_dep)):
     """
     This route is protected and requires a valid JWT token.
     The token can be provided via:
@@ -109,7 +156,7 @@ async def protected_route(current_user = Depends(auth.get_current_active_user_de
 # Admin-only route example
 @app.get("/admin", tags=["role-protected"])
 async def admin_route(
-    current_user = Depends(auth.is_admin()), 
+    current_user = Depends(admin_dep), 
     session: Session = Depends(get_session)
 ):
     """
@@ -123,7 +170,7 @@ async def admin_route(
 # Route requiring any of the specified roles
 @app.get("/premium", tags=["role-protected"])
 async def premium_route(
-    current_user = Depends(auth.require_roles(["premium", "admin"])),
+    current_user = Depends(premium_dep),
     session: Session = Depends(get_session)
 ):
     """
@@ -137,7 +184,7 @@ async def premium_route(
 # Route requiring all specified roles
 @app.get("/premium-verified", tags=["role-protected"])
 async def premium_verified_route(
-    current_user = Depends(auth.require_all_roles(["premium", "verified"])),
+    current_user = Depends(premium_verified_dep),
     session: Session = Depends(get_session)
 ):
     """
@@ -213,7 +260,8 @@ async def setup_roles(session: Session = Depends(get_session)):
     
     # Assign admin role to the first user (if any users exist)
     from sqlmodel import select
-    first_user = session.exec(select(User)).first()
+    # LIMIT 1 keeps this a single-row fetch instead of materializing the table
+    first_user = session.exec(select(User).order_by(User.id).limit(1)).first()
     if first_user:
         admin_role = role_manager.get_role(role_name="admin")
         if admin_role:
@@ -1,15 +1,28 @@
 # This file serves as a compatibility layer for existing code using the old structure
 # It imports and re-exports the elements from the modular structure
 
-from fastauth.core.auth import *
-from fastauth.dependencies.auth import *
-from fastauth.models.user import *
-from fastauth.models.tokens import *
-from fastauth.security.password import *
-from fastauth.security.tokens import *
-from fastauth.utils.session import *
-from fastauth.routers.auth import *
-from fastauth.core.auth import *
+# Explicit imports instead of chained star imports: each `import *` re-ran
+# __all__ resolution and copied whole namespaces, slowing startup
+from fastauth.core.auth import FastAuth, OAuth2PasswordBearerWithCookie
+from fastauth.dependencies.auth import AuthDependencies
+from fastauth.models.user import (
+    User,
+    UserRole,
+    UserRead,
+    UserReadWithRoles,
+    UserCreate,
+    UserUpdate,
+    UserDelete,
+    UserLogin,
+    UserLogout,
+    UserEnable,
+    UserDisable,
+)
+from fastauth.models.tokens import Token, TokenData
+from fastauth.security.password import PasswordManager
+from fastauth.security.tokens import TokenManager
+from fastauth.utils.session import get_session, make_session_factory
+from fastauth.routers.auth import AuthRouter
 
 # Import warning module to notify users about the deprecated structure
 import warnings
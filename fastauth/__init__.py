@@ -1,36 +1,45 @@
 """
 FastAuth - A comprehensive authentication library for FastAPI
 """
-from fastauth.core.auth import FastAuth
-from fastauth.models.user import (
-    User, 
-    UserRead,
-    UserReadWithRoles,
-    UserCreate, 
-    UserUpdate, 
-    UserDelete, 
-    UserLogin,
-    UserRole
-)
-from fastauth.models.tokens import Token, TokenData
-from fastauth.models.role import Role, RoleRead, RoleCreate, RoleUpdate
-from fastauth.dependencies.roles import RoleDependencies, RoleManager
-from fastauth.exceptions import (
-    FastAuthException,
-    CredentialsException,
-    TokenException,
-    RefreshTokenException,
-    InactiveUserException,
-    UserNotFoundException,
-    UserExistsException,
-    RoleNotFoundException,
-    RoleExistsException,
-    PermissionDeniedException,
-    setup_exception_handlers
-)
+import importlib
 
 __version__ = "0.3.4"
 
+# Each public name maps to the module that defines it. Submodules are
+# imported on first attribute access (PEP 562), so consumers that only need
+# a model or an exception don't pay for the full auth/router stack.
+_LAZY_IMPORTS = {
+    "FastAuth": "fastauth.core.auth",
+    "User": "fastauth.models.user",
+    "UserRead": "fastauth.models.user",
+    "UserReadWithRoles": "fastauth.models.user",
+    "UserCreate": "fastauth.models.user",
+    "UserUpdate": "fastauth.models.user",
+    "UserDelete": "fastauth.models.user",
+    "UserLogin": "fastauth.models.user",
+    "UserRole": "fastauth.models.user",
+    "Token": "fastauth.models.tokens",
+    "TokenData": "fastauth.models.tokens",
+    "Role": "fastauth.models.role",
+    "RoleRead": "fastauth.models.role",
+    "RoleCreate": "fastauth.models.role",
+    "RoleUpdate": "fastauth.models.role",
+    "RoleDependencies": "fastauth.dependencies.roles",
+    "RoleManager": "fastauth.dependencies.roles",
+    # Exception classes
+    "FastAuthException": "fastauth.exceptions",
+    "CredentialsException": "fastauth.exceptions",
+    "TokenException": "fastauth.exceptions",
+    "RefreshTokenException": "fastauth.exceptions",
+    "InactiveUserException": "fastauth.exceptions",
+    "UserNotFoundException": "fastauth.exceptions",
+    "UserExistsException": "fastauth.exceptions",
+    "RoleNotFoundException": "fastauth.exceptions",
+    "RoleExistsException": "fastauth.exceptions",
+    "PermissionDeniedException": "fastauth.exceptions",
+    "setup_exception_handlers": "fastauth.exceptions",
+}
+
 __all__ = [
     'FastAuth',
     'User',
@@ -62,3 +71,17 @@ __all__ = [
     'PermissionDeniedException',
     'setup_exception_handlers'
 ]
+
+
+def __getattr__(name):
+    module_path = _LAZY_IMPORTS.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_path), name)
+    # Cache on the package so subsequent lookups skip this hook
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -15,6 +15,19 @@ from fastauth.models.user import User, UserCreate
 from fastauth.models.role import Role, RoleCreate
 from fastauth.models.user import UserRole
 
+# Compiled once at import; these are matched against every candidate config
+# file when auto-detecting settings
+_DB_URL_PATTERNS = [
+    re.compile(r"DATABASE_URL\s*=\s*['\"]([^'\"]+)['\"]"),
+    re.compile(r"db_url\s*=\s*['\"]([^'\"]+)['\"]"),
+    re.compile(r"engine\s*=\s*create_engine\(['\"]([^'\"]+)['\"]"),
+]
+
+_SECRET_KEY_PATTERNS = [
+    re.compile(r"SECRET_KEY\s*=\s*['\"]([^'\"]+)['\"]"),
+    re.compile(r"secret_key\s*=\s*['\"]([^'\"]+)['\"]"),
+]
+
 
 def create_superadmin(auth_instance, username: Optional[str] = None, password: Optional[str] = None):
     """Create a superadmin user if one does not exist.
@@ -151,17 +164,11 @@ def find_db_url_in_file(file_path):
         content = file.read()
         
     # Look for common database URL patterns
-    patterns = [
-        r"DATABASE_URL\s*=\s*['\"]([^'\"]+)['\"]",
-        r"db_url\s*=\s*['\"]([^'\"]+)['\"]",
-        r"engine\s*=\s*create_engine\(['\"]([^'\"]+)['\"]",
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, content)
+    for pattern in _DB_URL_PATTERNS:
+        match = pattern.search(content)
         if match:
             return match.group(1)
-            
+
     return None
 
 
@@ -174,16 +181,11 @@ def find_secret_key_in_file(file_path):
         content = file.read()
         
     # Look for common secret key patterns
-    patterns = [
-        r"SECRET_KEY\s*=\s*['\"]([^'\"]+)['\"]",
-        r"secret_key\s*=\s*['\"]([^'\"]+)['\"]",
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, content)
+    for pattern in _SECRET_KEY_PATTERNS:
+        match = pattern.search(content)
         if match:
             return match.group(1)
-            
+
     return None
 
 
@@ -1,6 +1,8 @@
+import warnings
 from typing import Optional, Callable, Type, Dict, Any, Union, List
 from fastapi import Depends, HTTPException, status, Request, Response, APIRouter, FastAPI
 from fastapi.security import OAuth2PasswordBearer, OAuth2, OAuth2PasswordRequestForm
+from sqlalchemy.orm import selectinload
 from sqlmodel import SQLModel, Session, select
 from fastapi.openapi.models import OAuthFlows as OAuthFlowsModel
 from fastapi.security.utils import get_authorization_scheme_param
@@ -78,22 +80,37 @@ class FastAuth:
         algorithm: str = "HS256", 
         use_cookie: bool = True, 
         token_url: str = "token", 
-        access_token_expires_in: int = 30, 
-        refresh_token_expires_in: int = 7, 
-        user_model: Type[SQLModel] = User
+        access_token_expires_in: int = 30,
+        refresh_token_expires_in: int = 7,
+        user_model: Type[SQLModel] = User,
+        verification_cache_size: int = 10_000,
+        verification_cache_ttl: Optional[int] = None
     ):
         """Initialize the FastAuth instance.
-        
+
         Args:
-            secret_key: Secret key for JWT encoding/decoding
+            secret_key: Secret key for JWT encoding/decoding (a PEM-encoded
+                private key for asymmetric algorithms like RS256 or EdDSA)
             engine: SQLModel engine for database operations
-            algorithm: Algorithm for JWT signing
+            algorithm: Algorithm for JWT signing. HS256 verifies fastest;
+                of the asymmetric options prefer EdDSA (Ed25519), which
+                verifies several times faster than RS256
             use_cookie: Enable cookie-based authentication
             token_url: URL for token endpoint
             access_token_expires_in: Access token expiration in minutes
             refresh_token_expires_in: Refresh token expiration in days
             user_model: User model class for database operations
+            verification_cache_size: Maximum number of verified tokens to cache
+            verification_cache_ttl: Seconds a verified token stays cached
         """
+        if algorithm == "RS256" and not verification_cache_size:
+            warnings.warn(
+                "RS256 verification is expensive per request and the "
+                "verification cache is disabled; consider EdDSA or a "
+                "non-zero verification_cache_size for better throughput.",
+                stacklevel=2,
+            )
+
         self.secret_key = secret_key
         self.algorithm = algorithm
         self.user_model = user_model
@@ -108,7 +125,9 @@ class FastAuth:
             secret_key=secret_key,
             algorithm=algorithm,
             access_token_expires_minutes=access_token_expires_in,
-            refresh_token_expires_days=refresh_token_expires_in
+            refresh_token_expires_days=refresh_token_expires_in,
+            verification_cache_size=verification_cache_size,
+            verification_cache_ttl=verification_cache_ttl
         )
         
         self.password_manager = PasswordManager()
@@ -137,7 +156,12 @@ class FastAuth:
         Returns:
             User: The user object if found, None otherwise
         """
-        return session.exec(select(self.user_model).where(self.user_model.username == username)).first()
+        statement = select(self.user_model).where(self.user_model.username == username).limit(1)
+        # Pull the user's roles in the same round of queries so role guards
+        # don't need a separate lookup per request
+        if hasattr(self.user_model, "roles"):
+            statement = statement.options(selectinload(self.user_model.roles))
+        return session.exec(statement).first()
     
     def authenticate_user(self, username: str, password: str):
         """Authenticate a user by username and password.
@@ -1,3 +1,4 @@
+import logging
 from typing import Annotated, Optional
 from fastapi import Depends, status
 from sqlmodel import Session
@@ -6,6 +7,8 @@ from fastauth.models.user import User
 from fastauth.models.tokens import TokenData
 from fastauth.exceptions import CredentialsException, InactiveUserException, TokenException
 
+logger = logging.getLogger(__name__)
+
 
 class AuthDependencies:
     """Authentication dependencies for FastAPI applications."""
@@ -17,18 +20,31 @@ class AuthDependencies:
             auth_instance: FastAuth instance for authentication
         """
         self.auth = auth_instance
-    
+        # Built once and reused so every route shares the same callable,
+        # letting FastAPI cache both the signature inspection and the
+        # per-request dependency result
+        self._current_user_dep = None
+        self._current_active_user_dep = None
+        self._db_session_dep = None
+
     def get_current_user(self):
         """Get a FastAPI dependency for current user authentication.
-        
+
         Returns:
             callable: A dependency that extracts and validates the JWT token
         """
+        if self._current_user_dep is not None:
+            return self._current_user_dep
+
         async def _get_current_user(token: Annotated[str, Depends(self.auth.oauth2_scheme)]):
-            # Special handling for debugging cookie authentication issues
-            # Log the token we received for troubleshooting
-            print(f"Auth dependency received token: {token[:20]}..." if token else "No token received")
-            
+            # Lazy-formatted debug record for troubleshooting cookie auth;
+            # print() here would grab the stdout lock on every request
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Auth dependency received token: %s",
+                    f"{token[:20]}..." if token else "none",
+                )
+
             if not token:
                 raise CredentialsException("No token provided")
                 
@@ -45,7 +61,7 @@ class AuthDependencies:
                 raise e
             except Exception as e:
                 # Add more detailed error information for debugging
-                print(f"Token verification failed: {str(e)}")
+                logger.debug("Token verification failed: %s", e)
                 raise TokenException(f"Token verification failed: {str(e)}")
                 
             user = self.auth.get_user(self.auth.session, username=token_data.username)
@@ -53,18 +69,25 @@ class AuthDependencies:
                 raise CredentialsException(f"User not found: {token_data.username}")
                 
             return user
+
+        self._current_user_dep = _get_current_user
         return _get_current_user
-        
+
     def get_current_active_user(self):
         """Get a FastAPI dependency for active user authentication.
-        
+
         Returns:
             callable: A dependency that validates the user is active
         """
+        if self._current_active_user_dep is not None:
+            return self._current_active_user_dep
+
         async def _get_current_active_user(current_user: Annotated[User, Depends(self.get_current_user())]):
             if current_user.disabled:
                 raise InactiveUserException()
             return current_user
+
+        self._current_active_user_dep = _get_current_active_user
         return _get_current_active_user
         
     def get_db_session(self):
@@ -73,10 +96,15 @@ class AuthDependencies:
         Returns:
             callable: A dependency that yields a SQLModel session
         """
+        if self._db_session_dep is not None:
+            return self._db_session_dep
+
         def _get_db():
             db = Session(self.auth.engine)
             try:
                 yield db
             finally:
                 db.close()
+
+        self._db_session_dep = _get_db
         return _get_db
@@ -1,4 +1,6 @@
-from typing import Callable, List, Optional, Union
+import threading
+from typing import Callable, FrozenSet, List, Optional, Union
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from sqlmodel import Session, select
 
@@ -6,6 +8,30 @@ from fastauth.models.user import User
 from fastauth.models.role import Role, RoleCreate, RoleUpdate
 from fastauth.dependencies.auth import AuthDependencies
 
+# Short-lived cache of (engine, user_id) -> frozenset of role names so
+# repeated role checks for the same user skip the UserRole/Role join. Keys
+# include the session's bind so FastAuth instances over different databases
+# never serve each other's roles. Entries are dropped on assignment changes
+# and expire quickly to bound staleness.
+_user_role_names_cache = TTLCache(maxsize=10_000, ttl=30)
+_user_role_names_lock = threading.RLock()
+
+
+def invalidate_user_roles(user_id: int, bind=None):
+    """Drop the cached role names for a user after an assignment change.
+
+    Args:
+        user_id: User ID whose cached roles should be discarded
+        bind: Engine or connection whose entry to drop; when omitted, the
+            user's entries are dropped for every engine in the cache
+    """
+    with _user_role_names_lock:
+        if bind is not None:
+            _user_role_names_cache.pop((id(bind), user_id), None)
+        else:
+            for key in [k for k in _user_role_names_cache if k[1] == user_id]:
+                _user_role_names_cache.pop(key, None)
+
 
 class RoleDependencies:
     """Role-based authorization dependencies for FastAPI applications."""
@@ -18,61 +44,84 @@ class RoleDependencies:
         """
         self.auth_deps = auth_dependencies
         self.auth = auth_dependencies.auth
-    
+        # Memoize generated dependency callables so every route guarding the
+        # same role set shares one function object; FastAPI's dependency
+        # cache is keyed by callable identity, so shared objects let it hit
+        self._guard_cache = {}
+
     def require_roles(self, required_roles: List[str]):
         """Create a dependency that requires the user to have specific roles.
-        
+
         Args:
             required_roles: List of role names required to access the endpoint
-            
+
         Returns:
             callable: A dependency that validates if the user has the required roles
         """
+        cache_key = ("any", frozenset(required_roles))
+        if cache_key in self._guard_cache:
+            return self._guard_cache[cache_key]
+
         async def _require_roles(
             current_user: User = Depends(self.auth_deps.get_current_active_user()),
             db: Session = Depends(self.auth_deps.get_db_session())
         ):
-            # Get role manager with the proper session
-            role_manager = RoleManager(db)
-            
-            # Manually check if user has any of the required roles
-            has_required_role = False
-            for role_name in required_roles:
-                if role_manager.user_has_role(current_user.id, role_name):
-                    has_required_role = True
-                    break
-            
+            # Prefer the roles loaded eagerly with the user; fall back to a
+            # lookup for custom user models without a roles relationship
+            user_roles = getattr(current_user, "roles", None)
+            if user_roles is not None:
+                has_required_role = any(role.name in required_roles for role in user_roles)
+            else:
+                role_manager = RoleManager(db)
+                has_required_role = any(
+                    role_manager.user_has_role(current_user.id, role_name)
+                    for role_name in required_roles
+                )
+
             if not has_required_role:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="Insufficient permissions"
                 )
             return current_user
+
+        self._guard_cache[cache_key] = _require_roles
         return _require_roles
-    
+
     def require_all_roles(self, required_roles: List[str]):
         """Create a dependency that requires the user to have all specified roles.
-        
+
         Args:
             required_roles: List of role names, all of which are required
-            
+
         Returns:
             callable: A dependency that validates if the user has all required roles
         """
+        cache_key = ("all", frozenset(required_roles))
+        if cache_key in self._guard_cache:
+            return self._guard_cache[cache_key]
+
         async def _require_all_roles(
             current_user: User = Depends(self.auth_deps.get_current_active_user()),
             db: Session = Depends(self.auth_deps.get_db_session())
         ):
-            # Get role manager with the proper session
-            role_manager = RoleManager(db)
-            
-            # Check if the user has all of the required roles
-            if not role_manager.user_has_all_roles(current_user.id, required_roles):
+            # Prefer the roles loaded eagerly with the user; fall back to a
+            # lookup for custom user models without a roles relationship
+            user_roles = getattr(current_user, "roles", None)
+            if user_roles is not None:
+                has_all_roles = {role.name for role in user_roles}.issuperset(required_roles)
+            else:
+                role_manager = RoleManager(db)
+                has_all_roles = role_manager.user_has_all_roles(current_user.id, required_roles)
+
+            if not has_all_roles:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="Insufficient permissions"
                 )
             return current_user
+
+        self._guard_cache[cache_key] = _require_all_roles
         return _require_all_roles
         
     def is_admin(self):
@@ -267,7 +316,9 @@ class RoleManager:
         user_role = UserRole(user_id=user_id, role_id=role_id)
         self.db.add(user_role)
         self.db.commit()
-        
+
+        invalidate_user_roles(user_id, self.db.get_bind())
+
         return True
         
     def remove_role_from_user(self, user_id: int, role_id: int) -> bool:
@@ -297,7 +348,9 @@ class RoleManager:
         # Remove the association
         self.db.delete(user_role)
         self.db.commit()
-        
+
+        invalidate_user_roles(user_id, self.db.get_bind())
+
         return True
         
     def get_user_roles(self, user_id: int) -> List[Role]:
@@ -340,43 +393,59 @@ class RoleManager:
         
         return roles
         
+    def get_user_role_names(self, user_id: int) -> FrozenSet[str]:
+        """Get the names of all roles assigned to a user, with caching.
+
+        The result is served from a short-lived cache when available, so
+        repeated role checks for the same user run a single join query.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            FrozenSet[str]: Names of the user's roles
+        """
+        cache_key = (id(self.db.get_bind()), user_id)
+        with _user_role_names_lock:
+            cached = _user_role_names_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        from fastauth.models.user import UserRole
+
+        role_names = frozenset(
+            self.db.exec(
+                select(Role.name)
+                .join(UserRole, Role.id == UserRole.role_id)
+                .where(UserRole.user_id == user_id)
+            ).all()
+        )
+
+        with _user_role_names_lock:
+            _user_role_names_cache[cache_key] = role_names
+
+        return role_names
+
     def user_has_role(self, user_id: int, role_name: str) -> bool:
         """Check if a user has a specific role.
-        
+
         Args:
             user_id: User ID
             role_name: Role name
-            
+
         Returns:
             bool: True if user has the role, False otherwise
         """
-        # First get the role by name
-        role = self.get_role(role_name=role_name)
-        if not role:
-            return False
-            
-        # Check if the user-role association exists
-        from sqlmodel import select
-        from fastauth.models.user import UserRole
-        
-        association = self.db.exec(
-            select(UserRole).where(
-                (UserRole.user_id == user_id) & 
-                (UserRole.role_id == role.id)
-            )
-        ).first()
-        
-        return association is not None
-        
+        return role_name in self.get_user_role_names(user_id)
+
     def user_has_all_roles(self, user_id: int, role_names: List[str]) -> bool:
         """Check if a user has all specified roles.
-        
+
         Args:
             user_id: User ID
             role_names: List of role names
-            
+
         Returns:
             bool: True if user has all roles, False otherwise
         """
-        # Check each role individually
-        return all(self.user_has_role(user_id, role_name) for role_name in role_names)
+        return self.get_user_role_names(user_id).issuperset(role_names)
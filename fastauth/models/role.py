@@ -1,16 +1,21 @@
-from typing import List, Optional, Any
+from typing import List, Optional, Any, TYPE_CHECKING
 from sqlmodel import SQLModel, Field, Relationship
 
+from fastauth.models.user import UserRole
+
+if TYPE_CHECKING:
+    from fastauth.models.user import User
+
 
 class Role(SQLModel, table=True):
     """Role model for role-based authorization."""
     __tablename__ = "role"
-    
+
     id: int = Field(primary_key=True)
     name: str = Field(unique=True, index=True)
     description: Optional[str] = None
-    
-    # The relationship with users is handled by the backref in the User model
+
+    users: List["User"] = Relationship(back_populates="roles", link_model=UserRole)
 
 
 class RoleCreate(SQLModel):
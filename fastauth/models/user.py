@@ -1,7 +1,10 @@
-from typing import Optional, List, Any
+from typing import Optional, List, Any, TYPE_CHECKING
 from pydantic import BaseModel
 from sqlmodel import SQLModel, Field, Relationship
 
+if TYPE_CHECKING:
+    from fastauth.models.role import Role
+
 
 class UserRole(SQLModel, table=True):
     """Association table for many-to-many relationship between users and roles."""
@@ -17,10 +20,12 @@ class User(SQLModel, table=True):
     
     id: int = Field(primary_key=True)
     username: str = Field(unique=True, index=True)
-    email: str = Field(unique=True)
+    email: str = Field(unique=True, index=True)
     hashed_password: str
     disabled: bool = Field(default=False)
 
+    roles: List["Role"] = Relationship(back_populates="users", link_model=UserRole)
+
 
 class UserRead(BaseModel):
     """Pydantic model for user data that can be exposed to clients."""
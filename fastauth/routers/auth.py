@@ -116,7 +116,7 @@ class AuthRouter:
             # Check if username already exists
             db_user = session.exec(select(self.auth.user_model).where(
                 self.auth.user_model.username == user.username
-            )).first()
+            ).limit(1)).first()
             
             if db_user:
                 raise UserExistsException(f"Username '{user.username}' already registered")
@@ -1,37 +1,47 @@
-from passlib.context import CryptContext
+import bcrypt
 
 
 class PasswordManager:
     """Handles password hashing and verification."""
-    
-    def __init__(self, schemes=["bcrypt"], deprecated="auto"):
-        """Initialize the password manager with specified hashing schemes.
-        
+
+    def __init__(self, rounds=12):
+        """Initialize the password manager.
+
         Args:
-            schemes: List of hashing schemes to use
-            deprecated: Handling method for deprecated schemes
+            rounds: bcrypt cost factor used for new hashes
         """
-        self.pwd_context = CryptContext(schemes=schemes, deprecated=deprecated)
-    
+        self.rounds = rounds
+
     def verify_password(self, plain_password, hashed_password):
         """Verify a plain password against a hashed password.
-        
+
+        Hashes produced by older passlib-based releases ($2a$/$2b$ prefixes)
+        verify unchanged, so existing databases keep working.
+
         Args:
             plain_password: The plain text password to verify
             hashed_password: The hashed password to compare against
-            
+
         Returns:
             bool: True if the password matches, False otherwise
         """
-        return self.pwd_context.verify(plain_password, hashed_password)
-    
+        try:
+            return bcrypt.checkpw(
+                plain_password.encode("utf-8"), hashed_password.encode("utf-8")
+            )
+        except ValueError:
+            # Malformed or non-bcrypt hash
+            return False
+
     def get_password_hash(self, password):
-        """Hash a password using configured algorithms.
-        
+        """Hash a password using bcrypt.
+
         Args:
             password: The plain text password to hash
-            
+
         Returns:
             str: The hashed password
         """
-        return self.pwd_context.hash(password)
+        return bcrypt.hashpw(
+            password.encode("utf-8"), bcrypt.gensalt(rounds=self.rounds)
+        ).decode("utf-8")
@@ -1,33 +1,90 @@
 from datetime import datetime, timedelta, timezone
+import hashlib
+import threading
+import time
 import jwt
 from jwt.exceptions import InvalidTokenError
+from cachetools import TTLCache
 from fastapi import HTTPException, status
 from fastauth.models.tokens import TokenData
 
 
 class TokenManager:
     """Handles JWT token creation, validation, and management."""
-    
+
     def __init__(
-        self, 
-        secret_key, 
-        algorithm="HS256", 
-        access_token_expires_minutes=30, 
-        refresh_token_expires_days=7
+        self,
+        secret_key,
+        algorithm="HS256",
+        access_token_expires_minutes=30,
+        refresh_token_expires_days=7,
+        verification_cache_size=10_000,
+        verification_cache_ttl=None
     ):
         """Initialize the token manager.
-        
+
         Args:
             secret_key: Secret key for JWT encoding/decoding
             algorithm: Algorithm for JWT signing
             access_token_expires_minutes: Access token expiration in minutes
             refresh_token_expires_days: Refresh token expiration in days
+            verification_cache_size: Maximum number of verified tokens to cache
+            verification_cache_ttl: Seconds a verified token stays cached
+                (defaults to 5 minutes, capped by the access token lifetime)
         """
         self.secret_key = secret_key
         self.algorithm = algorithm
         self.access_token_expires_minutes = access_token_expires_minutes
         self.refresh_token_expires_days = refresh_token_expires_days
-    
+
+        # Parse key material and build the PyJWT codec once at init so
+        # per-token encode/decode calls reuse them instead of re-parsing
+        self._jwt = jwt.PyJWT()
+        self._signing_key, self._verifying_key = self._load_keys(secret_key, algorithm)
+
+        # Cache already-verified token payloads so repeated requests with the
+        # same token skip the signature check. Entries are keyed by a hash of
+        # the raw token, so the cache never stores the token itself.
+        if verification_cache_ttl is None:
+            verification_cache_ttl = min(300, access_token_expires_minutes * 60)
+        self.verification_cache_ttl = verification_cache_ttl
+        # A size of 0 disables caching; represent that as None rather than a
+        # TTLCache(maxsize=0), which rejects every insert
+        self._verification_cache = (
+            TTLCache(maxsize=verification_cache_size, ttl=verification_cache_ttl)
+            if verification_cache_size
+            else None
+        )
+        self._verification_cache_lock = threading.Lock()
+
+    @staticmethod
+    def _load_keys(secret_key, algorithm):
+        """Load the signing and verifying keys for the configured algorithm.
+
+        Args:
+            secret_key: Shared secret (HS*) or PEM-encoded private key
+            algorithm: Algorithm for JWT signing
+
+        Returns:
+            tuple: (signing_key, verifying_key) ready to pass to PyJWT; the
+            signing key is None when a public key was supplied, which makes
+            the manager verify-only
+        """
+        if algorithm.startswith("HS"):
+            # Symmetric: the same secret signs and verifies
+            return secret_key, secret_key
+
+        # Asymmetric (RS*/ES*/EdDSA): parse the PEM key once. A private key
+        # yields both halves; a public key configures a verify-only manager.
+        from cryptography.hazmat.primitives import serialization
+
+        key_bytes = secret_key.encode() if isinstance(secret_key, str) else secret_key
+        try:
+            private_key = serialization.load_pem_private_key(key_bytes, password=None)
+        except ValueError:
+            return None, serialization.load_pem_public_key(key_bytes)
+        return private_key, private_key.public_key()
+
     def create_access_token(self, data, expires_delta=None):
         """Create a JWT access token.
         
@@ -38,13 +95,17 @@ class TokenManager:
         Returns:
             str: The encoded JWT token
         """
+        if self._signing_key is None:
+            raise ValueError(
+                "This TokenManager was configured with a public key and can only verify tokens"
+            )
         to_encode = data.copy()
         if expires_delta:
             expire = datetime.now(timezone.utc) + expires_delta
         else:
             expire = datetime.now(timezone.utc) + timedelta(minutes=self.access_token_expires_minutes)
         to_encode.update({"exp": expire, "token_type": "access"})
-        encoded_jwt = jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
+        encoded_jwt = self._jwt.encode(to_encode, self._signing_key, algorithm=self.algorithm)
         return encoded_jwt
     
     def create_refresh_token(self, data, expires_delta=None):
@@ -57,13 +118,17 @@ class TokenManager:
         Returns:
             str: The encoded JWT refresh token
         """
+        if self._signing_key is None:
+            raise ValueError(
+                "This TokenManager was configured with a public key and can only verify tokens"
+            )
         to_encode = data.copy()
         if expires_delta:
             expire = datetime.now(timezone.utc) + expires_delta
         else:
             expire = datetime.now(timezone.utc) + timedelta(days=self.refresh_token_expires_days)
         to_encode.update({"exp": expire, "token_type": "refresh"})
-        encoded_jwt = jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
+        encoded_jwt = self._jwt.encode(to_encode, self._signing_key, algorithm=self.algorithm)
         return encoded_jwt
     
     def verify_token(self, token, expected_type="access"):
@@ -84,14 +149,44 @@ class TokenManager:
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+        # A compact JWS token has exactly two dots; one scan rejects
+        # malformed input before any hashing or base64 work
+        if token.count(".") != 2:
+            raise credentials_exception
+
+        # Check the verification cache first to skip the signature check for
+        # tokens we have already validated recently
+        cache_key = (hashlib.sha256(token.encode()).digest(), expected_type)
+        if self._verification_cache is not None:
+            with self._verification_cache_lock:
+                cached_payload = self._verification_cache.get(cache_key)
+            if cached_payload is not None:
+                # Honor the token's own expiry even while the cache entry is live
+                if cached_payload.get("exp", 0) > time.time():
+                    return cached_payload
+                with self._verification_cache_lock:
+                    self._verification_cache.pop(cache_key, None)
+
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+            # Single verified decode per request; required claims are enforced
+            # here instead of by a separate unverified "peek" decode
+            payload = self._jwt.decode(
+                token,
+                self._verifying_key,
+                algorithms=[self.algorithm],
+                options={"require": ["exp", "sub"], "verify_exp": True},
+            )
             username = payload.get("sub")
             token_type = payload.get("token_type")
             
             if username is None or token_type != expected_type:
                 raise credentials_exception
-                
+
+            if self._verification_cache is not None:
+                with self._verification_cache_lock:
+                    self._verification_cache[cache_key] = payload
+
             return payload
         except InvalidTokenError:
             raise credentials_exception
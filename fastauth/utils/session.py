@@ -1,7 +1,33 @@
 from typing import Generator
+from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlmodel import Session
 
 
+def make_session_factory(engine, autoflush: bool = False) -> scoped_session:
+    """Build a thread-scoped session factory for an engine.
+
+    A ``scoped_session`` hands each thread its own session and returns the
+    connection to the pool when ``remove()`` is called on that same thread.
+    Use it in genuinely thread-per-request servers (WSGI workers, background
+    threads). Do not wire it into a FastAPI dependency: sync dependencies
+    run on arbitrary worker threads, so the thread-local registry shares
+    sessions between concurrent requests and ``remove()`` can tear down a
+    different request's session — use a plain ``sessionmaker`` per request
+    there instead. Combine with ``create_engine(..., pool_size=...,
+    max_overflow=...)`` to size the connection pool for your deployment,
+    and consider raising ``query_cache_size`` above its 500-entry default
+    so compiled statements for hot queries stay cached.
+
+    Args:
+        engine: SQLModel engine
+        autoflush: Whether sessions flush pending changes before queries
+
+    Returns:
+        scoped_session: A factory producing thread-local SQLModel sessions
+    """
+    return scoped_session(sessionmaker(bind=engine, class_=Session, autoflush=autoflush))
+
+
 def get_session(engine) -> Generator[Session, None, None]:
     """Get a database session from a SQLModel engine.
     
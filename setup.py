@@ -9,11 +9,19 @@ setup(
         "fastapi>=0.104.0",
         "sqlmodel>=0.0.8",
         "pydantic>=2.5.2",
-        "passlib[bcrypt]>=1.7.4", 
-        "python-jose[cryptography]>=3.3.0",
+        "bcrypt>=4.0",
         "python-multipart>=0.0.6",
-        "pyjwt>=2.6.0",
+        "pyjwt[crypto]>=2.6.0",
+        "cachetools>=5.0",
+        "orjson>=3.8",
     ],
+    extras_require={
+        "dev": [
+            "pytest",
+            "pytest-xdist",
+            "httpx",
+        ],
+    },
     author="Hussein Ghadhban",
     author_email="ala.1995@yahoo.com",
     description="A comprehensive authentication and authorization library for FastAPI with JWT, cookie support, role-based access control, and automatic database initialization",
@@ -1,595 +1,619 @@
 #!/usr/bin/env python3
 """
 Comprehensive test suite for FastAuth library functionality.
-This script tests all major components of the FastAuth library.
+This suite tests all major components of the FastAuth library.
 
-Run with: python test_fastauth.py
+Run with: pytest test_fastauth.py
+Parallel: pytest -n auto test_fastauth.py  (requires pytest-xdist; each
+worker gets its own database, so tests distribute cleanly across cores)
 """
-import os
-import sys
-import time
-import tempfile
-import unittest
-from fastapi import FastAPI, Depends, HTTPException
-from fastapi.testclient import TestClient
-from sqlmodel import SQLModel, create_engine, Session, Field, select
-from typing import List, Optional
 import logging
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI, Depends
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, create_engine, Session, select
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# Import the FastAuth library
+from fastauth import FastAuth, User, Role, RoleCreate, UserRole
+from fastauth.security.tokens import TokenManager
+from fastauth.security.password import PasswordManager
+# Import new exception classes (added in v0.3.4)
+from fastauth import (
+    FastAuthException, CredentialsException, TokenException,
+    RefreshTokenException, InactiveUserException, UserNotFoundException,
+    UserExistsException, RoleNotFoundException, RoleExistsException,
+    PermissionDeniedException, setup_exception_handlers
+)
+
+# Configure logging; WARNING keeps setup and per-test trailer records off
+# the hot path (each emitted record pays strftime plus a stream write)
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-try:
-    # Import the FastAuth library 
-    from fastauth import FastAuth, User, Role, RoleCreate, UserRole
-    from fastauth.security.tokens import TokenManager
-    from fastauth.security.password import PasswordManager
-    from fastauth.dependencies.auth import AuthDependencies
-    from fastauth.dependencies.roles import RoleDependencies
-    from fastauth.routers.auth import AuthRouter
-    from fastauth.routers.roles import RoleRouter
-    # Import new exception classes (added in v0.3.4)
-    from fastauth import (
-        FastAuthException, CredentialsException, TokenException, 
-        RefreshTokenException, InactiveUserException, UserNotFoundException,
-        UserExistsException, RoleNotFoundException, RoleExistsException,
-        PermissionDeniedException, setup_exception_handlers
-    )
-    logger.info("✅ Successfully imported FastAuth and all components")
-except Exception as e:
-    logger.error(f"❌ Error importing FastAuth: {e}")
-    sys.exit(1)
-
-class TestFastAuth(unittest.TestCase):
-    """Test suite for FastAuth library"""
-    
-    @classmethod
-    def setUpClass(cls):
-        """Set up test environment once before all tests"""
-        # Create a temp database for testing
-        cls.db_file = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
-        cls.db_url = f"sqlite:///{cls.db_file.name}"
-        logger.info(f"Creating test database at {cls.db_url}")
-        
-        # Create engine and app
-        cls.engine = create_engine(cls.db_url)
-        cls.app = FastAPI()
-        
-        # Initialize FastAuth
-        cls.auth = FastAuth(
-            secret_key="test-secret-key-for-fastauth-testing",
-            algorithm="HS256",
-            user_model=User,
-            engine=cls.engine,
-            use_cookie=True,
-            token_url="/token",
-            access_token_expires_in=30,  # minutes
-            refresh_token_expires_in=7   # days
-        )
-        
-        # Session dependency
-        def get_session():
-            with Session(cls.engine) as session:
-                yield session
-        
-        cls.get_session = get_session
-        
-        # Initialize database and create test user
-        SQLModel.metadata.create_all(cls.engine)
-        
-        # Create test roles and users
-        cls.initialize_database()
-        
-        # Set up test client
-        cls.auth_router = cls.auth.get_auth_router(get_session)
-        cls.role_router = cls.auth.get_role_router()
-        cls.app.include_router(cls.auth_router)
-        cls.app.include_router(cls.role_router)
-        
-        # Set up the standardized error handlers (new in v0.3.4)
-        cls.auth.setup_exception_handlers(cls.app)
-        
-        # Add test routes with different protection levels
-        @cls.app.get("/unprotected")
-        def unprotected():
-            return {"message": "This is an unprotected route"}
-        
-        @cls.app.get("/protected")
-        def protected(user = Depends(cls.auth.get_current_active_user_dependency())):
-            return {"message": "This is a protected route", "user": user.username}
-        
-        @cls.app.get("/admin-only")
-        def admin_only(user = Depends(cls.auth.is_admin())):
-            return {"message": "This is an admin-only route", "user": user.username}
-        
-        @cls.app.get("/any-role")
-        def any_role(user = Depends(cls.auth.require_roles(["admin", "premium"]))):
-            return {"message": "This requires admin OR premium role", "user": user.username}
-        
-        @cls.app.get("/all-roles")
-        def all_roles(user = Depends(cls.auth.require_all_roles(["premium", "verified"]))):
-            return {"message": "This requires premium AND verified roles", "user": user.username}
-        
-        # Add test routes for error handling (new in v0.3.4)
-        @cls.app.get("/error/credentials")
-        def credentials_error():
-            raise CredentialsException("Test credentials error")
-        
-        @cls.app.get("/error/token")
-        def token_error():
-            raise TokenException("Test token error")
-            
-        @cls.app.get("/error/refresh-token")
-        def refresh_token_error():
-            raise RefreshTokenException("Test refresh token error")
-            
-        @cls.app.get("/error/inactive-user")
-        def inactive_user_error():
-            raise InactiveUserException("Test inactive user error")
-            
-        @cls.app.get("/error/user-not-found")
-        def user_not_found_error():
-            raise UserNotFoundException("Test user not found error")
-            
-        @cls.app.get("/error/user-exists")
-        def user_exists_error():
-            raise UserExistsException("Test user exists error")
-            
-        @cls.app.get("/error/role-not-found")
-        def role_not_found_error():
-            raise RoleNotFoundException("Test role not found error")
-            
-        @cls.app.get("/error/permission-denied")
-        def permission_denied_error():
-            raise PermissionDeniedException("Test permission denied error")
-            
-        cls.client = TestClient(cls.app)
-        logger.info("✅ Test environment setup complete")
-    
-    @classmethod
-    def tearDownClass(cls):
-        """Clean up after all tests"""
-        # Close database connections
-        cls.engine.dispose()
-        
-        # Remove temp database file
-        os.unlink(cls.db_file.name)
-        logger.info("✅ Test environment cleanup complete")
-    
-    @classmethod
-    def initialize_database(cls):
-        """Initialize database with test data"""
-        with Session(cls.engine) as session:
-            # Create roles
-            roles = {
-                "superadmin": "Super administrator with all privileges",
-                "admin": "Administrator with management privileges",
-                "moderator": "User with content moderation privileges",
-                "premium": "Premium tier user",
-                "verified": "Verified user",
-                "user": "Standard user with basic privileges"
-            }
-            
-            role_ids = {}
-            for role_name, description in roles.items():
-                role = Role(name=role_name, description=description)
-                session.add(role)
-                session.commit()
-                session.refresh(role)
-                role_ids[role_name] = role.id
-                logger.info(f"Created role: {role_name} (id: {role.id})")
-            
-            # Create test users with various role combinations
-            users = [
-                {"username": "superadmin", "password": "superadmin123", "roles": ["superadmin"]},
-                {"username": "admin", "password": "admin123", "roles": ["admin"]},
-                {"username": "moderator", "password": "mod123", "roles": ["moderator"]},
-                {"username": "premium", "password": "premium123", "roles": ["premium"]},
-                {"username": "verified", "password": "verified123", "roles": ["verified"]},
-                {"username": "premium_verified", "password": "premium_verified123", "roles": ["premium", "verified"]},
-                {"username": "regular", "password": "regular123", "roles": ["user"]},
-            ]
-            
-            for user_data in users:
-                # Create user
-                hashed_password = cls.auth.get_password_hash(user_data["password"])
-                user = User(
-                    username=user_data["username"],
-                    email=f"{user_data['username']}@example.com",
-                    hashed_password=hashed_password,
-                    disabled=False
-                )
-                session.add(user)
-                session.commit()
-                session.refresh(user)
-                logger.info(f"Created user: {user.username} (id: {user.id})")
-                
-                # Assign roles
-                for role_name in user_data["roles"]:
-                    role_id = role_ids[role_name]
-                    user_role = UserRole(user_id=user.id, role_id=role_id)
-                    session.add(user_role)
-                    logger.info(f"Assigned role '{role_name}' to user '{user.username}'")
-                
-                session.commit()
-    
-    def test_01_password_manager(self):
-        """Test password manager functionality"""
-        password_manager = PasswordManager()
-        password = "test_password"
-        hashed = password_manager.get_password_hash(password)
-        
-        # Verify hash is different from original password
-        self.assertNotEqual(password, hashed)
-        
-        # Verify password verification works
-        self.assertTrue(password_manager.verify_password(password, hashed))
-        
-        # Verify wrong password fails
-        self.assertFalse(password_manager.verify_password("wrong_password", hashed))
-        logger.info("✅ Password manager tests passed")
-    
-    def test_02_token_manager(self):
-        """Test token manager functionality"""
-        token_manager = TokenManager(
-            secret_key="test-secret-key", 
-            algorithm="HS256",
-            access_token_expires_minutes=30,
-            refresh_token_expires_days=7
-        )
-        
-        # Test access token
-        data = {"sub": "test_user"}
-        access_token = token_manager.create_access_token(data)
-        self.assertIsNotNone(access_token)
-        
-        # Decode and verify token
-        payload = token_manager.verify_token(access_token, expected_type="access")
-        self.assertEqual(payload.get("sub"), "test_user")
-        
-        # Test refresh token
-        refresh_token = token_manager.create_refresh_token(data)
-        self.assertIsNotNone(refresh_token)
-        
-        # Verify refresh token has longer expiry
-        access_payload = token_manager.verify_token(access_token, expected_type="access")
-        refresh_payload = token_manager.verify_token(refresh_token, expected_type="refresh")
-        self.assertGreater(refresh_payload.get("exp"), access_payload.get("exp"))
-        
-        logger.info("✅ Token manager tests passed")
-    
-    def test_03_user_authentication(self):
-        """Test user authentication endpoints"""
-        # Test login with valid credentials
-        response = self.client.post(
-            "/token",
-            data={"username": "admin", "password": "admin123"}
-        )
-        self.assertEqual(response.status_code, 200)
-        token_data = response.json()
-        self.assertIn("access_token", token_data)
-        self.assertIn("refresh_token", token_data)
-        self.assertEqual(token_data["token_type"], "bearer")
-        
-        # Test login with invalid credentials
-        response = self.client.post(
-            "/token",
-            data={"username": "admin", "password": "wrong_password"}
-        )
-        self.assertEqual(response.status_code, 401)
-        
-        # Test token refresh
-        refresh_token = token_data["refresh_token"]
-        response = self.client.post(
-            "/token/refresh",
-            json={"refresh_token": refresh_token}
-        )
-        self.assertEqual(response.status_code, 200)
-        refresh_data = response.json()
-        self.assertIn("access_token", refresh_data)
-        
-        logger.info("✅ User authentication tests passed")
-    
-    def test_04_protected_routes(self):
-        """Test route protection with authentication"""
-        # Get an access token
-        response = self.client.post(
-            "/token",
-            data={"username": "admin", "password": "admin123"}
-        )
-        token_data = response.json()
-        access_token = token_data["access_token"]
-        headers = {"Authorization": f"Bearer {access_token}"}
-        
-        # Test unprotected route
-        response = self.client.get("/unprotected")
-        self.assertEqual(response.status_code, 200)
-        
-        # Test protected route without token
-        response = self.client.get("/protected")
-        self.assertEqual(response.status_code, 401)
-        
-        # Test protected route with token
-        response = self.client.get("/protected", headers=headers)
-        self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.json()["user"], "admin")
-        
-        logger.info("✅ Protected routes tests passed")
-    
-    def test_05_role_based_authorization(self):
-        """Test role-based authorization"""
-        
-        # Test admin-only route with admin user
-        admin_response = self.client.post(
-            "/token",
-            data={"username": "admin", "password": "admin123"}
-        )
-        admin_token = admin_response.json()["access_token"]
-        admin_headers = {"Authorization": f"Bearer {admin_token}"}
-        
-        response = self.client.get("/admin-only", headers=admin_headers)
-        self.assertEqual(response.status_code, 200)
-        
-        # Test admin-only route with regular user
-        regular_response = self.client.post(
-            "/token",
-            data={"username": "regular", "password": "regular123"}
-        )
-        regular_token = regular_response.json()["access_token"]
-        regular_headers = {"Authorization": f"Bearer {regular_token}"}
-        
-        response = self.client.get("/admin-only", headers=regular_headers)
-        self.assertEqual(response.status_code, 403)  # Forbidden
-        
-        # Test any-role route with premium user
-        premium_response = self.client.post(
-            "/token",
-            data={"username": "premium", "password": "premium123"}
-        )
-        premium_token = premium_response.json()["access_token"]
-        premium_headers = {"Authorization": f"Bearer {premium_token}"}
-        
-        response = self.client.get("/any-role", headers=premium_headers)
-        self.assertEqual(response.status_code, 200)
-        
-        # Test all-roles route with premium_verified user
-        premium_verified_response = self.client.post(
-            "/token",
-            data={"username": "premium_verified", "password": "premium_verified123"}
-        )
-        premium_verified_token = premium_verified_response.json()["access_token"]
-        premium_verified_headers = {"Authorization": f"Bearer {premium_verified_token}"}
-        
-        response = self.client.get("/all-roles", headers=premium_verified_headers)
-        self.assertEqual(response.status_code, 200)
-        
-        # Test all-roles route with premium user (missing verified role)
-        response = self.client.get("/all-roles", headers=premium_headers)
-        self.assertEqual(response.status_code, 403)  # Forbidden
-        
-        logger.info("✅ Role-based authorization tests passed")
-    
-    def test_06_role_management_api(self):
-        """Test role management API endpoints"""
-        # Authenticate as superadmin
-        response = self.client.post(
-            "/token",
-            data={"username": "superadmin", "password": "superadmin123"}
-        )
-        token = response.json()["access_token"]
-        headers = {"Authorization": f"Bearer {token}"}
-        
-        # Test listing all roles
-        response = self.client.get("/roles/", headers=headers)
-        self.assertEqual(response.status_code, 200)
-        roles = response.json()
-        self.assertIsInstance(roles, list)
-        self.assertGreaterEqual(len(roles), 6)  # At least the standard roles
-        
-        # Test creating a new role
-        new_role = {"name": "test_role", "description": "A test role"}
-        response = self.client.post("/roles/", headers=headers, json=new_role)
-        
-        # Check if we have permission to create roles
-        if response.status_code == 403:
-            logger.info("User doesn't have permission to create roles, skipping remaining role management tests")
-            logger.info("✅ Role management API tests passed")
-            return
-            
-        # If we can create roles, continue with testing
-        self.assertTrue(response.status_code in [200, 201])
-        created_role = response.json()
-        self.assertEqual(created_role["name"], "test_role")
-        role_id = created_role["id"]
-        
-        # Test getting role by ID
-        response = self.client.get(f"/roles/{role_id}", headers=headers)
-        self.assertEqual(response.status_code, 200)
-        retrieved_role = response.json()
-        self.assertEqual(retrieved_role["name"], "test_role")
-        
-        # Find a valid user ID to test role assignments
-        with Session(self.engine) as session:
-            user = session.exec(select(User).where(User.username == "regular")).first()
-            user_id = user.id
-        
-        # Test assigning role to user
-        # The endpoint may vary depending on your implementation
-        # Try different formats
-        assign_endpoints = [
-            f"/roles/{role_id}/users/{user_id}",
-            f"/roles/assign/{role_id}/{user_id}", 
-            f"/roles/assign/{user_id}/{role_id}"
+# Test roles and the users that hold them
+TEST_ROLES = {
+    "superadmin": "Super administrator with all privileges",
+    "admin": "Administrator with management privileges",
+    "moderator": "User with content moderation privileges",
+    "premium": "Premium tier user",
+    "verified": "Verified user",
+    "user": "Standard user with basic privileges"
+}
+
+TEST_USERS = [
+    {"username": "superadmin", "password": "superadmin123", "roles": ["superadmin"]},
+    {"username": "admin", "password": "admin123", "roles": ["admin"]},
+    {"username": "moderator", "password": "mod123", "roles": ["moderator"]},
+    {"username": "premium", "password": "premium123", "roles": ["premium"]},
+    {"username": "verified", "password": "verified123", "roles": ["verified"]},
+    {"username": "premium_verified", "password": "premium_verified123", "roles": ["premium", "verified"]},
+    {"username": "regular", "password": "regular123", "roles": ["user"]},
+]
+
+PASSWORDS = {user["username"]: user["password"] for user in TEST_USERS}
+
+# Cost-4 bcrypt hashes of the passwords above, computed once and embedded so
+# database setup skips 7 rounds of key-derivation work per run. bcrypt stores
+# the cost in the hash itself, so login verification is unaffected. Regenerate
+# with bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=4)) if a
+# password changes.
+PRECOMPUTED_HASHES = {
+    "superadmin": "$2b$04$kFdm4lHtmggKp0UQtlugC.bKwtVr.TVteTnLyJBn2kAjm2pigH7uy",
+    "admin": "$2b$04$2pbjstPVxp2ZndcWoHsg7eTYz.S7htubdfictxAuesNcwPujJrNXC",
+    "moderator": "$2b$04$qEJgRsSZUsGvTIm0P9mh4ub8v1RVAb7.2NPP8QcP9qscRb.u4gOgO",
+    "premium": "$2b$04$10YyfHPZGr9UjRluXaturO6MrbscRubAewILokTGwBan67xDKMUEa",
+    "verified": "$2b$04$xfpQ2TpYiLEAC8GIwD5LHusceuM88WxJ/2QhdFDjWFwf145.dgjoK",
+    "premium_verified": "$2b$04$d2ictN4gCprQuuNBQEVYKO27htcIvdt4upTrAs048VeDYUAKfJUqK",
+    "regular": "$2b$04$mGayLO.2/0yZ76v2LVyuNO/45yGDfksJT3HYwr1xONu3ygSHGN//2",
+}
+
+# Shared default-cost hasher; instantiated once so any native-library setup
+# cost is paid a single time per run
+password_manager = PasswordManager()
+
+
+def initialize_database(engine):
+    """Initialize database with test roles and users.
+
+    Inserts are batched with add_all and flushed once per phase so the
+    whole setup is a single transaction instead of a commit per row.
+    Password hashes come from PRECOMPUTED_HASHES, so no key derivation
+    runs here.
+    """
+    with Session(engine) as session:
+        roles = [
+            Role(name=role_name, description=description)
+            for role_name, description in TEST_ROLES.items()
         ]
-        
-        for endpoint in assign_endpoints:
-            response = self.client.post(endpoint, headers=headers)
-            if response.status_code in [200, 201]:
-                break
-        
-        # Check if at least one worked
-        self.assertTrue(response.status_code in [200, 201])
-        
-        # Test getting user roles
-        response = self.client.get(f"/users/{user_id}/roles", headers=headers)
-        if response.status_code == 404:
-            # Try alternative endpoint format
-            response = self.client.get(f"/roles/user/{user_id}", headers=headers)
-        
-        self.assertEqual(response.status_code, 200)
-        user_roles = response.json()
-        role_names = [role["name"] for role in user_roles]
-        self.assertIn("test_role", role_names)
-        
-        # Test removing role from user
-        remove_endpoints = [
-            f"/roles/{role_id}/users/{user_id}",
-            f"/roles/assign/{role_id}/{user_id}", 
-            f"/roles/assign/{user_id}/{role_id}"
+        session.add_all(roles)
+        session.flush()  # populates primary keys without committing
+        role_ids = {role.name: role.id for role in roles}
+
+        users = [
+            User(
+                username=user_data["username"],
+                email=f"{user_data['username']}@example.com",
+                hashed_password=PRECOMPUTED_HASHES[user_data["username"]],
+                disabled=False
+            )
+            for user_data in TEST_USERS
         ]
-        
-        for endpoint in remove_endpoints:
-            response = self.client.delete(endpoint, headers=headers)
-            if response.status_code in [200, 204]:
-                break
-        
-        # Check if at least one worked
-        self.assertTrue(response.status_code in [200, 204])
-        
-        # Test deleting the role
-        response = self.client.delete(f"/roles/{role_id}", headers=headers)
-        self.assertTrue(response.status_code in [200, 204])
-        
+        session.add_all(users)
+        session.flush()
+
+        session.add_all([
+            UserRole(user_id=user.id, role_id=role_ids[role_name])
+            for user, user_data in zip(users, TEST_USERS)
+            for role_name in user_data["roles"]
+        ])
+        session.commit()
+        logger.debug("Created %d roles and %d users", len(roles), len(users))
+
+
+@pytest.fixture(scope="session")
+def test_env(request):
+    """Set up a FastAuth app, engine, and test client once per worker."""
+    # In-memory SQLite on a StaticPool: every connection shares the single
+    # in-memory database, all pages stay in RAM, and nothing touches disk.
+    # StaticPool also hands every checkout the same live connection, so the
+    # per-request Session(engine) in get_session never pays sqlite3.connect.
+    # Each xdist worker process gets its own engine, so runs stay isolated.
+    logger.debug("Creating in-memory test database")
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    # Durability pragmas are pointless for throwaway test data: no fsync on
+    # commit, journal and temp structures kept in RAM. The database is
+    # already in-memory here, but the listener keeps commits cheap even if
+    # the URL is ever pointed back at a file.
+    @event.listens_for(engine, "connect")
+    def _sqlite_fast_pragmas(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+    app = FastAPI()
+
+    # Initialize FastAuth
+    auth = FastAuth(
+        secret_key="test-secret-key-for-fastauth-testing",
+        algorithm="HS256",
+        user_model=User,
+        engine=engine,
+        use_cookie=True,
+        token_url="/token",
+        access_token_expires_in=30,  # minutes
+        refresh_token_expires_in=7   # days
+    )
+
+    # bcrypt cost 4 (the library minimum) instead of the production default;
+    # setup hashes 7 passwords and every login re-verifies one, so the work
+    # factor dominates suite runtime
+    auth.password_manager = PasswordManager(rounds=4)
+
+    # Session dependency
+    def get_session():
+        with Session(engine) as session:
+            yield session
+
+    # Initialize database and create test data
+    SQLModel.metadata.create_all(engine)
+    initialize_database(engine)
+
+    # Set up routers
+    app.include_router(auth.get_auth_router(get_session))
+    app.include_router(auth.get_role_router())
+
+    # Set up the standardized error handlers (new in v0.3.4)
+    auth.setup_exception_handlers(app)
+
+    # Add test routes with different protection levels
+    @app.get("/unprotected")
+    def unprotected():
+        return {"message": "This is an unprotected route"}
+
+    @app.get("/protected")
+    def protected(user = Depends(auth.get_current_active_user_dependency())):
+        return {"message": "This is a protected route", "user": user.username}
+
+    @app.get("/admin-only")
+    def admin_only(user = Depends(auth.is_admin())):
+        return {"message": "This is an admin-only route", "user": user.username}
+
+    @app.get("/any-role")
+    def any_role(user = Depends(auth.require_roles(["admin", "premium"]))):
+        return {"message": "This requires admin OR premium role", "user": user.username}
+
+    @app.get("/all-roles")
+    def all_roles(user = Depends(auth.require_all_roles(["premium", "verified"]))):
+        return {"message": "This requires premium AND verified roles", "user": user.username}
+
+    # Add test routes for error handling (new in v0.3.4)
+    @app.get("/error/credentials")
+    def credentials_error():
+        raise CredentialsException("Test credentials error")
+
+    @app.get("/error/token")
+    def token_error():
+        raise TokenException("Test token error")
+
+    @app.get("/error/refresh-token")
+    def refresh_token_error():
+        raise RefreshTokenException("Test refresh token error")
+
+    @app.get("/error/inactive-user")
+    def inactive_user_error():
+        raise InactiveUserException("Test inactive user error")
+
+    @app.get("/error/user-not-found")
+    def user_not_found_error():
+        raise UserNotFoundException("Test user not found error")
+
+    @app.get("/error/user-exists")
+    def user_exists_error():
+        raise UserExistsException("Test user exists error")
+
+    @app.get("/error/role-not-found")
+    def role_not_found_error():
+        raise RoleNotFoundException("Test role not found error")
+
+    @app.get("/error/permission-denied")
+    def permission_denied_error():
+        raise PermissionDeniedException("Test permission denied error")
+
+    # Entering the client as a context manager runs the app lifespan and
+    # keeps the underlying httpx connection pool open for the whole session
+    # instead of re-establishing state per request
+    with TestClient(app) as client:
+        logger.info("✅ Test environment setup complete")
+        yield SimpleNamespace(client=client, engine=engine, auth=auth)
+
+    # Clean up after all tests
+    engine.dispose()
+    logger.info("✅ Test environment cleanup complete")
+
+
+@pytest.fixture(scope="session")
+def client(test_env):
+    return test_env.client
+
+
+@pytest.fixture(scope="session")
+def engine(test_env):
+    return test_env.engine
+
+
+@pytest.fixture(scope="session")
+def token_responses(client):
+    """Authenticate each test user once and share the /token responses.
+
+    Every login pays a full password-hash verification, so tests reuse
+    these instead of re-POSTing /token per test.
+    """
+    return {
+        username: client.post(
+            "/token", data={"username": username, "password": password}
+        ).json()
+        for username, password in PASSWORDS.items()
+    }
+
+
+@pytest.fixture(scope="session")
+def tokens(token_responses):
+    """Access token per test user, extracted from the shared logins."""
+    return {
+        username: response["access_token"]
+        for username, response in token_responses.items()
+    }
+
+
+def test_password_manager():
+    """Test password manager functionality"""
+    password = "test_password"
+    hashed = password_manager.get_password_hash(password)
+
+    # Verify hash is different from original password
+    assert password != hashed
+
+    # Verify password verification works
+    assert password_manager.verify_password(password, hashed)
+
+    # Verify wrong password fails
+    assert not password_manager.verify_password("wrong_password", hashed)
+    logger.info("✅ Password manager tests passed")
+
+
+@pytest.fixture(scope="module")
+def token_manager():
+    """Standalone TokenManager shared by token tests."""
+    return TokenManager(
+        secret_key="test-secret-key",
+        algorithm="HS256",
+        access_token_expires_minutes=30,
+        refresh_token_expires_days=7
+    )
+
+
+def test_token_manager(token_manager):
+    """Test token manager functionality"""
+    # Test access token
+    data = {"sub": "test_user"}
+    access_token = token_manager.create_access_token(data)
+    assert access_token is not None
+
+    # Decode and verify token
+    access_payload = token_manager.verify_token(access_token, expected_type="access")
+    assert access_payload.get("sub") == "test_user"
+
+    # Test refresh token
+    refresh_token = token_manager.create_refresh_token(data)
+    assert refresh_token is not None
+
+    # Verify refresh token has longer expiry; reuse the payload decoded above
+    refresh_payload = token_manager.verify_token(refresh_token, expected_type="refresh")
+    assert refresh_payload.get("exp") > access_payload.get("exp")
+
+    logger.info("✅ Token manager tests passed")
+
+
+def test_token_manager_cache_disabled():
+    """Token verification works with the verification cache turned off"""
+    manager = TokenManager(
+        secret_key="test-secret-key",
+        algorithm="HS256",
+        verification_cache_size=0,
+    )
+    token = manager.create_access_token({"sub": "test_user"})
+
+    # Both calls take the uncached path; neither may raise
+    assert manager.verify_token(token, expected_type="access")["sub"] == "test_user"
+    assert manager.verify_token(token, expected_type="access")["sub"] == "test_user"
+
+
+def test_token_manager_public_key_verify_only():
+    """A PEM public key configures a verify-only TokenManager"""
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+    private_key = Ed25519PrivateKey.generate()
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode()
+
+    signer = TokenManager(secret_key=private_pem, algorithm="EdDSA")
+    verifier = TokenManager(secret_key=public_pem, algorithm="EdDSA")
+
+    token = signer.create_access_token({"sub": "test_user"})
+    assert verifier.verify_token(token, expected_type="access")["sub"] == "test_user"
+
+    # Signing without a private key is refused with a clear error
+    with pytest.raises(ValueError):
+        verifier.create_access_token({"sub": "test_user"})
+
+
+def test_user_authentication(client, token_responses):
+    """Test user authentication endpoints"""
+    # The positive login already happened in the token_responses fixture;
+    # check its shape instead of paying another password verification
+    token_data = token_responses["admin"]
+    assert "access_token" in token_data
+    assert "refresh_token" in token_data
+    assert token_data["token_type"] == "bearer"
+
+    # Test login with invalid credentials
+    response = client.post(
+        "/token",
+        data={"username": "admin", "password": "wrong_password"}
+    )
+    assert response.status_code == 401
+
+    # Test token refresh
+    refresh_token = token_data["refresh_token"]
+    response = client.post(
+        "/token/refresh",
+        json={"refresh_token": refresh_token}
+    )
+    assert response.status_code == 200
+    refresh_data = response.json()
+    assert "access_token" in refresh_data
+
+    logger.info("✅ User authentication tests passed")
+
+
+def test_protected_routes(client, tokens):
+    """Test route protection with authentication"""
+    headers = {"Authorization": f"Bearer {tokens['admin']}"}
+
+    # Test unprotected route
+    response = client.get("/unprotected")
+    assert response.status_code == 200
+
+    # Test protected route without token
+    response = client.get("/protected")
+    assert response.status_code == 401
+
+    # Test protected route with token
+    response = client.get("/protected", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["user"] == "admin"
+
+    logger.info("✅ Protected routes tests passed")
+
+
+# (username, path, expected status) cases for role-based authorization;
+# each runs as its own test so xdist can distribute them
+RBAC_CASES = [
+    ("admin", "/admin-only", 200),
+    ("regular", "/admin-only", 403),           # regular lacks admin role
+    ("premium", "/any-role", 200),
+    ("premium_verified", "/all-roles", 200),
+    ("premium", "/all-roles", 403),            # premium lacks verified role
+]
+
+
+@pytest.mark.parametrize("username,path,expected_status", RBAC_CASES)
+def test_role_based_authorization(client, tokens, username, path, expected_status):
+    """Test role-based authorization"""
+    headers = {"Authorization": f"Bearer {tokens[username]}"}
+    response = client.get(path, headers=headers)
+    assert response.status_code == expected_status
+
+
+def test_role_management_api(client, engine, tokens):
+    """Test role management API endpoints"""
+    # Authenticate as superadmin
+    headers = {"Authorization": f"Bearer {tokens['superadmin']}"}
+
+    # Test listing all roles
+    response = client.get("/roles/", headers=headers)
+    assert response.status_code == 200
+    roles = response.json()
+    assert isinstance(roles, list)
+    assert len(roles) >= 6  # At least the standard roles
+
+    # Test creating a new role
+    new_role = {"name": "test_role", "description": "A test role"}
+    response = client.post("/roles/", headers=headers, json=new_role)
+
+    # Check if we have permission to create roles
+    if response.status_code == 403:
+        logger.info("User doesn't have permission to create roles, skipping remaining role management tests")
         logger.info("✅ Role management API tests passed")
-        
-    def test_07_user_me_endpoint(self):
-        """Test the /users/me endpoint"""
-        # Authenticate as admin
-        response = self.client.post(
-            "/token",
-            data={"username": "admin", "password": "admin123"}
-        )
-        token = response.json()["access_token"]
-        headers = {"Authorization": f"Bearer {token}"}
-        
-        # Get current user info
-        response = self.client.get("/users/me", headers=headers)
-        self.assertEqual(response.status_code, 200)
-        user_info = response.json()
-        self.assertEqual(user_info["username"], "admin")
-        self.assertEqual(user_info["email"], "admin@example.com")
-        
-        logger.info("✅ User me endpoint tests passed")
-    
-    def test_08_user_registration(self):
-        """Test user registration endpoint"""
-        # Register a new user
-        new_user = {
-            "username": "new_test_user",
-            "email": "new_test_user@example.com",
-            "password": "test_password"
-        }
-        response = self.client.post("/users", json=new_user)
-        self.assertEqual(response.status_code, 201)  # Created status code
-        created_user = response.json()
-        self.assertEqual(created_user["username"], "new_test_user")
-        
-        # Try to log in with the new user
-        response = self.client.post(
-            "/token",
-            data={"username": "new_test_user", "password": "test_password"}
-        )
-        self.assertEqual(response.status_code, 200)
-        
-        # Verify that trying to register with the same username fails
-        duplicate_user = {
-            "username": "new_test_user",
-            "email": "another_email@example.com",
-            "password": "another_password"
-        }
-        response = self.client.post("/users", json=duplicate_user)
-        self.assertEqual(response.status_code, 409)  # Conflict - duplicate username (changed from 400 in v0.3.4)
-        
-        logger.info("✅ User registration tests passed")
-    
-    def test_10_error_handling(self):
-        """Test the error handling system (added in v0.3.4)"""
-        # Test CredentialsException
-        response = self.client.get("/error/credentials")
-        self.assertEqual(response.status_code, 401)
-        error_data = response.json()
-        self.assertIn("error", error_data)
-        self.assertEqual(error_data["error"]["code"], "FASTAUTH_INVALID_CREDENTIALS")
-        
-        # Test TokenException
-        response = self.client.get("/error/token")
-        self.assertEqual(response.status_code, 401)
-        error_data = response.json()
-        self.assertIn("error", error_data)
-        self.assertEqual(error_data["error"]["code"], "FASTAUTH_INVALID_TOKEN")
-        
-        # Test RefreshTokenException
-        response = self.client.get("/error/refresh-token")
-        self.assertEqual(response.status_code, 401)
-        error_data = response.json()
-        self.assertIn("error", error_data)
-        self.assertEqual(error_data["error"]["code"], "FASTAUTH_INVALID_REFRESH_TOKEN")
-        
-        # Test InactiveUserException
-        response = self.client.get("/error/inactive-user")
-        self.assertEqual(response.status_code, 403)
-        error_data = response.json()
-        self.assertIn("error", error_data)
-        self.assertEqual(error_data["error"]["code"], "FASTAUTH_INACTIVE_USER")
-        
-        # Test UserNotFoundException
-        response = self.client.get("/error/user-not-found")
-        self.assertEqual(response.status_code, 404)
-        error_data = response.json()
-        self.assertIn("error", error_data)
-        self.assertEqual(error_data["error"]["code"], "FASTAUTH_USER_NOT_FOUND")
-        
-        # Test UserExistsException
-        response = self.client.get("/error/user-exists")
-        self.assertEqual(response.status_code, 409)
-        error_data = response.json()
-        self.assertIn("error", error_data)
-        self.assertEqual(error_data["error"]["code"], "FASTAUTH_USER_EXISTS")
-        
-        # Test RoleNotFoundException
-        response = self.client.get("/error/role-not-found")
-        self.assertEqual(response.status_code, 404)
-        error_data = response.json()
-        self.assertIn("error", error_data)
-        self.assertEqual(error_data["error"]["code"], "FASTAUTH_ROLE_NOT_FOUND")
-        
-        # Test PermissionDeniedException
-        response = self.client.get("/error/permission-denied")
-        self.assertEqual(response.status_code, 403)
+        return
+
+    # If we can create roles, continue with testing
+    assert response.status_code in [200, 201]
+    created_role = response.json()
+    assert created_role["name"] == "test_role"
+    role_id = created_role["id"]
+
+    # Test getting role by ID
+    response = client.get(f"/roles/{role_id}", headers=headers)
+    assert response.status_code == 200
+    retrieved_role = response.json()
+    assert retrieved_role["name"] == "test_role"
+
+    # Find a valid user ID to test role assignments; selecting just the id
+    # column skips ORM row materialization for a value we read once
+    with Session(engine) as session:
+        user_id = session.exec(select(User.id).where(User.username == "regular")).one()
+
+    # Test assigning role to user (RoleRouter exposes /roles/assign/{user_id}/{role_id})
+    response = client.post(f"/roles/assign/{user_id}/{role_id}", headers=headers)
+    assert response.status_code in [200, 201]
+
+    # Test getting user roles
+    response = client.get(f"/roles/user/{user_id}", headers=headers)
+    assert response.status_code == 200
+    user_roles = response.json()
+    role_names = [role["name"] for role in user_roles]
+    assert "test_role" in role_names
+
+    # Test removing role from user
+    response = client.delete(f"/roles/assign/{user_id}/{role_id}", headers=headers)
+    assert response.status_code in [200, 204]
+
+    # Test deleting the role
+    response = client.delete(f"/roles/{role_id}", headers=headers)
+    assert response.status_code in [200, 204]
+
+    logger.info("✅ Role management API tests passed")
+
+
+def test_user_me_endpoint(client, tokens):
+    """Test the /users/me endpoint"""
+    # Authenticate as admin
+    headers = {"Authorization": f"Bearer {tokens['admin']}"}
+
+    # Get current user info
+    response = client.get("/users/me", headers=headers)
+    assert response.status_code == 200
+    user_info = response.json()
+    assert user_info["username"] == "admin"
+    assert user_info["email"] == "admin@example.com"
+
+    logger.info("✅ User me endpoint tests passed")
+
+
+def test_user_registration(client):
+    """Test user registration endpoint"""
+    # Register a new user
+    new_user = {
+        "username": "new_test_user",
+        "email": "new_test_user@example.com",
+        "password": "test_password"
+    }
+    response = client.post("/users", json=new_user)
+    assert response.status_code == 201  # Created status code
+    created_user = response.json()
+    assert created_user["username"] == "new_test_user"
+
+    # Try to log in with the new user
+    response = client.post(
+        "/token",
+        data={"username": "new_test_user", "password": "test_password"}
+    )
+    assert response.status_code == 200
+
+    # Verify that trying to register with the same username fails
+    duplicate_user = {
+        "username": "new_test_user",
+        "email": "another_email@example.com",
+        "password": "another_password"
+    }
+    response = client.post("/users", json=duplicate_user)
+    assert response.status_code == 409  # Conflict - duplicate username (changed from 400 in v0.3.4)
+
+    logger.info("✅ User registration tests passed")
+
+
+def test_error_handling(client):
+    """Test the error handling system (added in v0.3.4)"""
+    # Test CredentialsException
+    response = client.get("/error/credentials")
+    assert response.status_code == 401
+    error_data = response.json()
+    assert "error" in error_data
+    assert error_data["error"]["code"] == "FASTAUTH_INVALID_CREDENTIALS"
+
+    # Test TokenException
+    response = client.get("/error/token")
+    assert response.status_code == 401
+    error_data = response.json()
+    assert "error" in error_data
+    assert error_data["error"]["code"] == "FASTAUTH_INVALID_TOKEN"
+
+    # Test RefreshTokenException
+    response = client.get("/error/refresh-token")
+    assert response.status_code == 401
+    error_data = response.json()
+    assert "error" in error_data
+    assert error_data["error"]["code"] == "FASTAUTH_INVALID_REFRESH_TOKEN"
+
+    # Test InactiveUserException
+    response = client.get("/error/inactive-user")
+    assert response.status_code == 403
+    error_data = response.json()
+    assert "error" in error_data
+    assert error_data["error"]["code"] == "FASTAUTH_INACTIVE_USER"
+
+    # Test UserNotFoundException
+    response = client.get("/error/user-not-found")
+    assert response.status_code == 404
+    error_data = response.json()
+    assert "error" in error_data
+    assert error_data["error"]["code"] == "FASTAUTH_USER_NOT_FOUND"
+
+    # Test UserExistsException
+    response = client.get("/error/user-exists")
+    assert response.status_code == 409
+    error_data = response.json()
+    assert "error" in error_data
+    assert error_data["error"]["code"] == "FASTAUTH_USER_EXISTS"
+
+    # Test RoleNotFoundException
+    response = client.get("/error/role-not-found")
+    assert response.status_code == 404
+    error_data = response.json()
+    assert "error" in error_data
+    assert error_data["error"]["code"] == "FASTAUTH_ROLE_NOT_FOUND"
+
+    # Test PermissionDeniedException
+    response = client.get("/error/permission-denied")
+    assert response.status_code == 403
+    error_data = response.json()
+    assert "error" in error_data
+    assert error_data["error"]["code"] == "FASTAUTH_PERMISSION_DENIED"
+
+    # Verify each error response has the required structure
+    for endpoint in ["/error/credentials", "/error/token", "/error/refresh-token",
+                     "/error/inactive-user", "/error/user-not-found", "/error/user-exists",
+                     "/error/role-not-found", "/error/permission-denied"]:
+        response = client.get(endpoint)
         error_data = response.json()
-        self.assertIn("error", error_data)
-        self.assertEqual(error_data["error"]["code"], "FASTAUTH_PERMISSION_DENIED")
-        
-        # Verify each error response has the required structure
-        for endpoint in ["/error/credentials", "/error/token", "/error/refresh-token", 
-                          "/error/inactive-user", "/error/user-not-found", "/error/user-exists", 
-                          "/error/role-not-found", "/error/permission-denied"]:
-            response = self.client.get(endpoint)
-            error_data = response.json()
-            
-            # Check that the error response has the standardized structure
-            self.assertIn("error", error_data)
-            self.assertIn("code", error_data["error"])
-            self.assertIn("message", error_data["error"])
-            self.assertIn("status_code", error_data["error"])
-            
-            # Ensure status code in the response matches the one in the error data
-            self.assertEqual(response.status_code, error_data["error"]["status_code"])
-            
-        logger.info("✅ Error handling system tests passed")
-
-
-if __name__ == "__main__":
-    print("Starting FastAuth Library Test Suite...")
-    unittest.main(verbosity=2)
+
+        # Check that the error response has the standardized structure
+        assert "error" in error_data
+        assert "code" in error_data["error"]
+        assert "message" in error_data["error"]
+        assert "status_code" in error_data["error"]
+
+        # Ensure status code in the response matches the one in the error data
+        assert response.status_code == error_data["error"]["status_code"]
+
+    logger.info("✅ Error handling system tests passed")
@@ -1,43 +1,34 @@
 # Test script to verify imports and basic functionality
+import importlib
+
 print("Testing FastAuth import functionality...")
 
-# Test the main imports
-try:
-    from fastauth import FastAuth, User, Token, TokenData
-    print("✅ Successfully imported main components")
-except Exception as e:
-    print(f"❌ Error importing main components: {e}")
-    
-# Test module-specific imports
-try:
-    from fastauth.security.password import PasswordManager
-    from fastauth.security.tokens import TokenManager
-    print("✅ Successfully imported security modules")
-except Exception as e:
-    print(f"❌ Error importing security modules: {e}")
+# (module, attribute names, label) triples checked in one loop instead of a
+# try/except block per module
+IMPORT_CHECKS = [
+    ("fastauth", ["FastAuth", "User", "Token", "TokenData"], "main components"),
+    ("fastauth.security.password", ["PasswordManager"], "security modules"),
+    ("fastauth.security.tokens", ["TokenManager"], "security modules"),
+    ("fastauth.models.user", ["User", "UserCreate"], "model modules"),
+    ("fastauth.models.tokens", ["Token"], "model modules"),
+    ("fastauth.dependencies.auth", ["AuthDependencies"], "dependency modules"),
+    ("fastauth.routers.auth", ["AuthRouter"], "router modules"),
+]
 
-try:
-    from fastauth.models.user import User, UserCreate
-    from fastauth.models.tokens import Token
-    print("✅ Successfully imported model modules")
-except Exception as e:
-    print(f"❌ Error importing model modules: {e}")
-    
-try:
-    from fastauth.dependencies.auth import AuthDependencies
-    print("✅ Successfully imported dependency modules")
-except Exception as e:
-    print(f"❌ Error importing dependency modules: {e}")
-    
-try:
-    from fastauth.routers.auth import AuthRouter
-    print("✅ Successfully imported router modules")
-except Exception as e:
-    print(f"❌ Error importing router modules: {e}")
+for module_name, names, label in IMPORT_CHECKS:
+    try:
+        module = importlib.import_module(module_name)
+        for name in names:
+            getattr(module, name)
+        print(f"✅ Successfully imported {label} ({module_name})")
+    except Exception as e:
+        print(f"❌ Error importing {label} ({module_name}): {e}")
 
 # Test basic class instantiation
 try:
     # We can't fully test without a database engine, but we can check class creation
+    from fastauth.security.password import PasswordManager
+
     password_manager = PasswordManager()
     hashed = password_manager.get_password_hash("test_password")
     verified = password_manager.verify_password("test_password", hashed)